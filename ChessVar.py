@@ -1,225 +1,367 @@
+import random
+from array import array
+
+# Piece codes stored in the board: white pieces are positive, black pieces negative.
+EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(7)
+
+# Display character for each piece code; negative codes index from the end.
+PIECE_CHARS = '.PNBRQKkqrbnp'
+
+
+def _square_mask(row, col):
+    """Returns the bitboard mask of the square at (row, col), or 0 if it is off the board."""
+
+    if 0 <= row < 8 and 0 <= col < 8:
+        return 1 << (8 * row + col)
+    return 0
+
+
+def _between_mask(from_square, to_square):
+    """Returns the bitboard mask of squares strictly between two squares on a shared line."""
+
+    from_row, from_col = divmod(from_square, 8)
+    to_row, to_col = divmod(to_square, 8)
+    row_diff, col_diff = to_row - from_row, to_col - from_col
+
+    if row_diff != 0 and col_diff != 0 and abs(row_diff) != abs(col_diff):
+        return 0
+
+    row_step = (row_diff > 0) - (row_diff < 0)
+    col_step = (col_diff > 0) - (col_diff < 0)
+
+    mask = 0
+    current_row, current_col = from_row + row_step, from_col + col_step
+    while current_row != to_row or current_col != to_col:
+        mask |= _square_mask(current_row, current_col)
+        current_row += row_step
+        current_col += col_step
+    return mask
+
+
+def _knight_mask(square):
+    """Returns the bitboard mask of squares a knight on the given square attacks."""
+
+    row, col = divmod(square, 8)
+    return sum(_square_mask(row + dr, col + dc) for dr, dc in
+               ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)))
+
+
+def _king_mask(square):
+    """Returns the bitboard mask of squares a king on the given square attacks."""
+
+    row, col = divmod(square, 8)
+    return sum(_square_mask(row + dr, col + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+
+
+KNIGHT_ATTACKS = tuple(_knight_mask(sq) for sq in range(64))
+
+# Squares a king on each square attacks.
+KING_ATTACKS = tuple(_king_mask(sq) for sq in range(64))
+
+# Squares cleared by a capture on each square: the capture square and its neighbours.
+EXPLOSION_MASK = tuple(KING_ATTACKS[sq] | (1 << sq) for sq in range(64))
+
+# Squares that must be empty for a pawn on its starting rank to advance two squares; 0 elsewhere.
+DOUBLE_PUSH_BLOCK_WHITE = tuple((1 << (sq - 8)) | (1 << (sq - 16)) if sq // 8 == 6 else 0 for sq in range(64))
+DOUBLE_PUSH_BLOCK_BLACK = tuple((1 << (sq + 8)) | (1 << (sq + 16)) if sq // 8 == 1 else 0 for sq in range(64))
+
+
+def _ray_mask(square, diagonal):
+    """Returns the bitboard mask of squares sharing a rank/file (or a diagonal) with the given square."""
+
+    row, col = divmod(square, 8)
+    mask = 0
+    for other in range(64):
+        other_row, other_col = divmod(other, 8)
+        if other == square:
+            continue
+        if diagonal and abs(other_row - row) == abs(other_col - col):
+            mask |= 1 << other
+        elif not diagonal and (other_row == row or other_col == col):
+            mask |= 1 << other
+    return mask
+
+
+# Squares a rook or bishop on each square could reach on an empty board.
+ROOK_RAYS = tuple(_ray_mask(sq, False) for sq in range(64))
+BISHOP_RAYS = tuple(_ray_mask(sq, True) for sq in range(64))
+QUEEN_RAYS = tuple(rook | bishop for rook, bishop in zip(ROOK_RAYS, BISHOP_RAYS))
+
+# Square index (8 * row + col) for each algebraic position, e.g. 'e2' -> 52.
+POS_INDEX = {f"{col}{row}": 8 * (8 - row) + i for i, col in enumerate('abcdefgh') for row in range(1, 9)}
+
+# BETWEEN[from_sq][to_sq] holds the squares a sliding piece passes over between the two squares.
+BETWEEN = tuple(tuple(_between_mask(from_sq, to_sq) for to_sq in range(64)) for from_sq in range(64))
+
+# Zobrist keys: ZOBRIST_PIECE[piece code][square], with negative codes indexing from the end.
+_zobrist_rng = random.Random(0xC0FFEE)
+ZOBRIST_PIECE = tuple(
+    tuple(0 if code == EMPTY else _zobrist_rng.getrandbits(64) for _ in range(64))
+    for code in range(len(PIECE_CHARS))
+)
+# XORed into the hash while black is to move.
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
+
+
+def _clear_path(from_square, to_square, occupied):
+    """Checks if no occupied square lies strictly between two squares."""
+
+    return BETWEEN[from_square][to_square] & occupied == 0
+
+
+def _slide(from_square, to_square, rays, occupied):
+    """Validates a sliding move: the target lies on one of the rays and the path is clear."""
+
+    return (1 << to_square) & rays[from_square] != 0 and _clear_path(from_square, to_square, occupied)
+
+
+def _pawn_move(from_square, to_square, white, occupied, opponents):
+    """Validates a pawn move, including capturing diagonally."""
+
+    if white:
+        direction = -1
+        double_push_block = DOUBLE_PUSH_BLOCK_WHITE[from_square]
+    else:
+        direction = 1
+        double_push_block = DOUBLE_PUSH_BLOCK_BLACK[from_square]
+
+    # Move forward
+    if to_square == from_square + 8 * direction:
+        return not (occupied >> to_square) & 1
+    if to_square == from_square + 16 * direction:
+        return double_push_block != 0 and double_push_block & occupied == 0
+
+    # Capture
+    from_row, from_col = divmod(from_square, 8)
+    to_row, to_col = divmod(to_square, 8)
+    if abs(to_col - from_col) == 1 and to_row == from_row + direction:
+        if (opponents >> to_square) & 1:
+            return True
+
+    return False
+
+
+def _knight_move(from_square, to_square, white, occupied, opponents):
+    """Validates a knight move."""
+
+    return (1 << to_square) & KNIGHT_ATTACKS[from_square] != 0
+
+
+def _bishop_move(from_square, to_square, white, occupied, opponents):
+    """Validates a bishop move."""
+
+    return _slide(from_square, to_square, BISHOP_RAYS, occupied)
+
+
+def _rook_move(from_square, to_square, white, occupied, opponents):
+    """Validates a rook move."""
+
+    return _slide(from_square, to_square, ROOK_RAYS, occupied)
+
+
+def _queen_move(from_square, to_square, white, occupied, opponents):
+    """Validates a queen move."""
+
+    return _slide(from_square, to_square, QUEEN_RAYS, occupied)
+
+
+def _king_move(from_square, to_square, white, occupied, opponents):
+    """Validates a king move."""
+
+    return (1 << to_square) & KING_ATTACKS[from_square] != 0
+
+
+# Move validator for each piece type, indexed by abs(piece code). Validators take
+# only integers and a bool so they stay independent of the ChessVar instance.
+_MOVE_FUNCS = (None, _pawn_move, _knight_move, _bishop_move, _rook_move, _queen_move, _king_move)
+
+
 class ChessVar:
     """Atomic Chess Game with methods for initialization, movement, game state handling, and visualizing the board."""
 
+    __slots__ = ('_board', '_occ_white', '_occ_black', '_piece_counts',
+                 '_side', '_hash', '_current_game_state')
+
     def __init__(self):
         """Initializes the chess board, game state, and sets the current turn to white."""
 
         self._board = self.initialize_board()
-        self._turn = "white"
+        self._occ_white = sum(1 << square for square, piece in enumerate(self._board) if piece > 0)
+        self._occ_black = sum(1 << square for square, piece in enumerate(self._board) if piece < 0)
+        self._piece_counts = self.initialize_piece_counts()
+        self._side = 1  # 1 when white is to move, -1 for black
+        self._hash = self.compute_hash()
         self._current_game_state = "UNFINISHED"
-        self._columns = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
-        self._columns_indexes = {col: x for x, col in enumerate(self._columns)}
 
     def initialize_board(self):
         """Initializes the board with pieces in standard chess starting positions."""
 
-        board = [["." for _ in range(8)] for _ in range(8)]
-        special_pieces = 'RNBQKBNR'
+        board = array('b', [EMPTY] * 64)
+        special_pieces = (ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK)
 
         for i, x in enumerate(special_pieces):
-            board[0][i] = x.lower()
-            board[1][i] = 'p'
-            board[6][i] = 'P'
-            board[7][i] = x
+            board[i] = -x
+            board[8 + i] = -PAWN
+            board[48 + i] = PAWN
+            board[56 + i] = x
         return board
 
+    def initialize_piece_counts(self):
+        """Counts the pieces of each type and color on the board."""
+
+        return {piece: self._board.count(piece) for piece in range(-KING, KING + 1) if piece != EMPTY}
+
     def position_index(self, position):
-        """Converts user input (e.g., 'e2') to board indices."""
+        """Converts user input (e.g., 'e2') to a square index (8 * row + col)."""
 
-        if len(position) != 2 or position[0] not in self._columns or not position[1].isdigit():
-            return None, None
+        return POS_INDEX.get(position)
 
-        col, row = position[0], position[1]
-        col_index = self._columns_indexes[col]
-        row_index = 8 - int(row)
+    def compute_hash(self):
+        """Computes the Zobrist hash of the position from scratch."""
 
-        if not (0 <= col_index < 8 and 0 <= row_index < 8):
-            return None, None
+        position_hash = 0 if self._side > 0 else ZOBRIST_SIDE
+        for square, piece in enumerate(self._board):
+            position_hash ^= ZOBRIST_PIECE[piece][square]
+        return position_hash
 
-        return row_index, col_index
+    def get_hash(self):
+        """Returns the incrementally maintained Zobrist hash of the current position."""
 
-    def clear_path(self, from_position, to_position):
-        """Checks if the path between two positions is clear (no pieces in the way)."""
-        from_row, from_col = self.position_index(from_position)
-        to_row, to_col = self.position_index(to_position)
+        return self._hash
 
-        row_step = 0 if from_row == to_row else (1 if to_row > from_row else -1)
-        col_step = 0 if from_col == to_col else (1 if to_col > from_col else -1)
+    def set_square(self, square, piece):
+        """Places a piece (or EMPTY) on a square, keeping the board, occupancy, piece counts and hash in sync."""
 
-        current_row, current_col = from_row + row_step, from_col + col_step
+        old_piece = self._board[square]
+        mask = 1 << square
+        self._hash ^= ZOBRIST_PIECE[old_piece][square] ^ ZOBRIST_PIECE[piece][square]
 
-        while (current_row != to_row or current_col != to_col):
-            if self._board[current_row][current_col] != '.':
-                return False
-            current_row += row_step
-            current_col += col_step
+        if old_piece != EMPTY:
+            self._piece_counts[old_piece] -= 1
+            if old_piece > 0:
+                self._occ_white &= ~mask
+            else:
+                self._occ_black &= ~mask
+        if piece != EMPTY:
+            self._piece_counts[piece] += 1
+            if piece > 0:
+                self._occ_white |= mask
+            else:
+                self._occ_black |= mask
+        self._board[square] = piece
 
-        return True
+    def move_context(self, square):
+        """Returns (white, occupied, opponents) for the piece on the given square."""
 
-    def pawn_move(self, from_row, from_col, to_row, to_col):
-        """Handles pawn movement, including capturing diagonally."""
-        piece = self._board[from_row][from_col]
+        white = self._board[square] > 0
+        return white, self._occ_white | self._occ_black, self._occ_black if white else self._occ_white
 
-        if piece.isupper():
-            # White pawn
-            direction = -1
-            start_row = 6
-            opponent_piece = lambda x: x.islower()
-        else:
-            # Black pawn
-            direction = 1
-            start_row = 1
-            opponent_piece = lambda x: x.isupper()
-
-        # Move forward
-        if to_col == from_col:
-            if to_row == from_row + direction and self._board[to_row][to_col] == '.':
-                return True
-            if from_row == start_row and to_row == from_row + 2 * direction and self._board[from_row + direction][to_col] == '.' and self._board[to_row][to_col] == '.':
-                return True
-        # Capture
-        elif abs(to_col - from_col) == 1 and to_row == from_row + direction:
-            if self._board[to_row][to_col] != '.' and opponent_piece(self._board[to_row][to_col]):
-                return True
-
-        return False
-
-    def rook_move(self, from_position, to_position):
-        """Handles rook movement."""
-        from_row, from_col = self.position_index(from_position)
-        to_row, to_col = self.position_index(to_position)
+    def clear_path(self, from_square, to_square):
+        """Checks if the path between two squares is clear (no pieces in the way)."""
 
-        if from_row == to_row or from_col == to_col:
-            return self.clear_path(from_position, to_position)
-        return False
+        return _clear_path(from_square, to_square, self._occ_white | self._occ_black)
 
-    def knight_move(self, from_position, to_position):
-        """Handles knight movement."""
-        from_row, from_col = self.position_index(from_position)
-        to_row, to_col = self.position_index(to_position)
+    def pawn_move(self, from_square, to_square):
+        """Handles pawn movement, including capturing diagonally."""
+        return _pawn_move(from_square, to_square, *self.move_context(from_square))
 
-        row_diff = abs(to_row - from_row)
-        col_diff = abs(to_col - from_col)
+    def rook_move(self, from_square, to_square):
+        """Handles rook movement."""
+        return _rook_move(from_square, to_square, *self.move_context(from_square))
 
-        return (row_diff, col_diff) in [(2, 1), (1, 2)]
+    def knight_move(self, from_square, to_square):
+        """Handles knight movement."""
+        return _knight_move(from_square, to_square, *self.move_context(from_square))
 
-    def bishop_move(self, from_position, to_position):
+    def bishop_move(self, from_square, to_square):
         """Handles bishop movement."""
-        from_row, from_col = self.position_index(from_position)
-        to_row, to_col = self.position_index(to_position)
+        return _bishop_move(from_square, to_square, *self.move_context(from_square))
 
-        if abs(to_row - from_row) == abs(to_col - from_col):
-            return self.clear_path(from_position, to_position)
-        return False
-
-    def queen_move(self, from_position, to_position):
+    def queen_move(self, from_square, to_square):
         """Handles queen movement."""
-        return self.rook_move(from_position, to_position) or self.bishop_move(from_position, to_position)
+        return _queen_move(from_square, to_square, *self.move_context(from_square))
 
-    def king_move(self, from_position, to_position):
+    def king_move(self, from_square, to_square):
         """Handles king movement."""
-        from_row, from_col = self.position_index(from_position)
-        to_row, to_col = self.position_index(to_position)
-
-        return abs(to_row - from_row) <= 1 and abs(to_col - from_col) <= 1
-
-    def valid_move(self, from_position, to_position):
-        """Checks if a move is valid."""
-
-        from_row, from_col = self.position_index(from_position)
-        to_row, to_col = self.position_index(to_position)
-
-        if from_row is None or to_row is None:
-            return False
+        return _king_move(from_square, to_square, *self.move_context(from_square))
 
-        piece = self._board[from_row][from_col]
-        target = self._board[to_row][to_col]
+    def valid_move(self, from_square, to_square):
+        """Checks if a move between two decoded squares is valid."""
 
-        if piece == '.':
-            return False
+        piece = self._board[from_square]
+        side = self._side
 
-        if (self._turn == 'white' and piece.islower()) or (self._turn == 'black' and piece.isupper()):
+        # Empty squares and the opponent's pieces cannot be moved
+        if piece * side <= 0:
             return False
 
-        if (self._turn == 'white' and target.isupper()) or (self._turn == 'black' and target.islower()):
+        # A move may not land on one of the mover's own pieces
+        if self._board[to_square] * side > 0:
             return False
 
-        move_funcs = {
-            'P': self.pawn_move,
-            'R': self.rook_move,
-            'N': self.knight_move,
-            'B': self.bishop_move,
-            'Q': self.queen_move,
-            'K': self.king_move
-        }
-
-        piece_type = piece.upper()
-        if piece_type in move_funcs:
-            if piece_type == 'P':
-                return move_funcs[piece_type](from_row, from_col, to_row, to_col)
-            else:
-                return move_funcs[piece_type](from_position, to_position)
-        return False
+        white = piece > 0
+        return _MOVE_FUNCS[abs(piece)](from_square, to_square, white, self._occ_white | self._occ_black,
+                                       self._occ_black if white else self._occ_white)
 
-    def move_piece(self, from_position, to_position):
+    def move_piece(self, from_square, to_square):
         """Moves a piece on the board."""
 
-        from_row, from_col = self.position_index(from_position)
-        to_row, to_col = self.position_index(to_position)
+        self.set_square(to_square, self._board[from_square])
+        self.set_square(from_square, EMPTY)
 
-        self._board[to_row][to_col] = self._board[from_row][from_col]
-        self._board[from_row][from_col] = '.'
+    def explode_capture(self, square):
+        """Handles explosion in atomic chess; a king caught in the blast ends the game."""
 
-    def explode_capture(self, position):
-        """Handles explosion in atomic chess."""
+        mask = EXPLOSION_MASK[square]
 
-        row, col = self.position_index(position)
+        hit = mask & (self._occ_white | self._occ_black)
+        self._occ_white &= ~mask
+        self._occ_black &= ~mask
 
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                r, c = row + dr, col + dc
-                if 0 <= r < 8 and 0 <= c < 8:
-                    piece = self._board[r][c]
-                    if piece != '.':
-                        if piece.upper() == 'K':
-                            self._current_game_state = 'BLACK_WON' if piece.islower() else 'WHITE_WON'
-                        self._board[r][c] = '.'
+        while hit:
+            low_bit = hit & -hit
+            hit_square = low_bit.bit_length() - 1
+            piece = self._board[hit_square]
+            self._piece_counts[piece] -= 1
+            self._hash ^= ZOBRIST_PIECE[piece][hit_square]
+            self._board[hit_square] = EMPTY
+            hit ^= low_bit
 
-    def make_move(self, from_position, to_position):
+        if self._piece_counts[KING] == 0:
+            self._current_game_state = 'BLACK_WON'
+        elif self._piece_counts[-KING] == 0:
+            self._current_game_state = 'WHITE_WON'
 
+    def make_move(self, from_position, to_position):
+        """Validates and plays a move given in algebraic positions (e.g., 'e2', 'e4')."""
 
         if self._current_game_state != 'UNFINISHED':
             print("Game Over!")
             return False
 
-        if not self.valid_move(from_position, to_position):
+        from_square = POS_INDEX.get(from_position)
+        to_square = POS_INDEX.get(to_position)
+        if from_square is None or to_square is None or not self.valid_move(from_square, to_square):
             print("Invalid move. Try again.")
             return False
 
-        from_row, from_col = self.position_index(from_position)
-        to_row, to_col = self.position_index(to_position)
-        target_piece = self._board[to_row][to_col]
-        moving_piece = self._board[from_row][from_col]
-
-        self.move_piece(from_position, to_position)
+        moving_piece = self._board[from_square]
+        target_piece = self._board[to_square]
+        to_row = to_square // 8
+        self.move_piece(from_square, to_square)
 
-        if target_piece != '.':
+        if target_piece != EMPTY:
             # Explosion occurs; destroy pieces in 3x3 area
-            self.explode_capture(to_position)
+            self.explode_capture(to_square)
         else:
             # Handle pawn promotion
-            if moving_piece.upper() == 'P':
-                if (moving_piece.isupper() and to_row == 0) or (moving_piece.islower() and to_row == 7):
-                    self._board[to_row][to_col] = 'Q' if moving_piece.isupper() else 'q'
-
-        # Check win condition
-        if not any('K' in row for row in self._board):
-            self._current_game_state = 'BLACK_WON'
-        elif not any('k' in row for row in self._board):
-            self._current_game_state = 'WHITE_WON'
+            if abs(moving_piece) == PAWN:
+                if (moving_piece > 0 and to_row == 0) or (moving_piece < 0 and to_row == 7):
+                    self.set_square(to_square, QUEEN if moving_piece > 0 else -QUEEN)
 
         if self._current_game_state == 'UNFINISHED':
-            self._turn = 'black' if self._turn == 'white' else 'white'
+            self._side = -self._side
+            self._hash ^= ZOBRIST_SIDE
 
         return True
 
@@ -232,19 +374,16 @@ class ChessVar:
     def print_board(self):
         """Prints the board."""
 
-        print('  a b c d e f g h')
+        rows = ['  a b c d e f g h']
         for row in range(8):
-            row_str = str(8 - row) + ' '
-            for col in range(8):
-                row_str += self._board[row][col] + ' '
-            print(row_str)
-        print()
+            rows.append(f"{8 - row} " + ' '.join(PIECE_CHARS[piece] for piece in self._board[row * 8:row * 8 + 8]))
+        print('\n'.join(rows), end='\n\n')
 
 if __name__ == "__main__":
     game = ChessVar()
     while game.get_game_state() == 'UNFINISHED':
         game.print_board()
-        print(f"{game._turn.capitalize()}'s turn.")
+        print(f"{'White' if game._side > 0 else 'Black'}'s turn.")
         from_pos = input("Enter the position of the piece you want to move (ex: e2): ").strip()
         to_pos = input("Enter the position to move to (ex: e4): ").strip()
 
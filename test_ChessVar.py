@@ -0,0 +1,55 @@
+import contextlib
+import io
+import unittest
+
+from ChessVar import EMPTY, KING, PAWN, POS_INDEX, QUEEN, ROOK, ChessVar
+
+
+class ZobristHashTest(unittest.TestCase):
+    """Checks that the incrementally updated hash matches a full recomputation."""
+
+    def play(self, game, moves):
+        """Plays each (from, to) move, asserting it succeeds and the hash stays in sync."""
+
+        for from_position, to_position in moves:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertTrue(game.make_move(from_position, to_position), (from_position, to_position))
+            self.assertEqual(game.get_hash(), game.compute_hash(), (from_position, to_position))
+
+    def place(self, game, pieces):
+        """Sets up squares through set_square, which keeps the hash up to date."""
+
+        for position, piece in pieces.items():
+            game.set_square(POS_INDEX[position], piece)
+        self.assertEqual(game.get_hash(), game.compute_hash())
+
+    def test_initial_hash(self):
+        game = ChessVar()
+        self.assertEqual(game.get_hash(), game.compute_hash())
+
+    def test_quiet_moves_and_captures(self):
+        game = ChessVar()
+        self.play(game, [('e2', 'e4'), ('d7', 'd5'), ('e4', 'd5'), ('d8', 'd5'), ('g1', 'f3'), ('d5', 'a2')])
+        self.assertEqual(game.get_game_state(), 'UNFINISHED')
+
+    def test_capture_explodes_king(self):
+        game = ChessVar()
+        self.play(game, [('e2', 'e4'), ('a7', 'a6'), ('d1', 'h5'), ('a6', 'a5'), ('h5', 'f7')])
+        self.assertEqual(game.get_game_state(), 'WHITE_WON')
+
+    def test_double_king_explosion(self):
+        game = ChessVar()
+        self.place(game, {'e1': EMPTY, 'e8': EMPTY, 'd4': KING, 'e5': -KING, 'd5': -PAWN, 'a5': ROOK})
+        self.play(game, [('a5', 'd5')])
+        self.assertEqual(game.get_game_state(), 'BLACK_WON')
+
+    def test_promotion(self):
+        game = ChessVar()
+        self.place(game, {'a8': EMPTY, 'a7': PAWN, 'h1': EMPTY, 'h2': -PAWN})
+        self.play(game, [('a7', 'a8'), ('h2', 'h1')])
+        self.assertEqual(game._board[POS_INDEX['a8']], QUEEN)
+        self.assertEqual(game._board[POS_INDEX['h1']], -QUEEN)
+
+
+if __name__ == '__main__':
+    unittest.main()